@@ -18,7 +18,7 @@ except ImportError:
     print("Error: qdrant-client is not installed. Please run: pip install qdrant-client")
     sys.exit(1)
 
-from qdrant_manager.config import get_profiles, get_config_dir
+from qdrant_manager.config import get_profiles, get_config_dir, load_config
 from qdrant_manager.utils import load_configuration, initialize_qdrant_client
 
 from qdrant_manager.commands.create import create_collection
@@ -176,7 +176,10 @@ For --add, if omitted, adds to root; if provided, adds under that key."""
     
     # Handle config command separately (doesn't need client initialization)
     if args.command == "config":
-        if len(sys.argv) == 2 or (len(sys.argv) == 3 and args.profile):
+        # Options other than --profile don't apply to the config view yet
+        extra_options = [name for name, value in vars(args).items()
+                         if name not in ("command", "profile") and value != parser.get_default(name)]
+        if not extra_options:
              # Just show available profiles or config path
             profiles = get_profiles()
             print("Available configuration profiles:")
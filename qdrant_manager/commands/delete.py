@@ -1,8 +1,17 @@
 import logging
+import time
+import httpx
 from qdrant_client import QdrantClient
+from qdrant_client.http.exceptions import ResponseHandlingException
 
 logger = logging.getLogger(__name__)
 
+# Transport failures (connection refused/reset, timeouts) are retried with
+# exponential backoff: 0.5s, 1s, 2s. Server responses such as 404, and
+# responses that fail to parse after the delete went through, are not.
+DELETE_MAX_RETRIES = 3
+DELETE_BACKOFF_FACTOR = 0.5
+
 def delete_collection(client: QdrantClient, collection_name: str):
     """Handles the logic for the 'delete' command."""
     if not collection_name:
@@ -10,8 +19,20 @@ def delete_collection(client: QdrantClient, collection_name: str):
         return
 
     logger.info(f"Deleting collection '{collection_name}'")
-    try:
-        client.delete_collection(collection_name=collection_name)
-        logger.info(f"Collection '{collection_name}' deleted successfully.")
-    except Exception as e:
-        logger.error(f"Failed to delete collection '{collection_name}': {e}") 
\ No newline at end of file
+    retries = 0
+    while True:
+        try:
+            client.delete_collection(collection_name=collection_name)
+            logger.info(f"Collection '{collection_name}' deleted successfully.")
+            return
+        except ResponseHandlingException as e:
+            if not isinstance(e.source, httpx.TransportError) or retries >= DELETE_MAX_RETRIES:
+                logger.error(f"Failed to delete collection '{collection_name}': {e}")
+                return
+            delay = DELETE_BACKOFF_FACTOR * (2 ** retries)
+            retries += 1
+            logger.warning(f"Delete request error (attempt {retries}/{DELETE_MAX_RETRIES}), retrying in {delay}s: {e}")
+            time.sleep(delay)
+        except Exception as e:
+            logger.error(f"Failed to delete collection '{collection_name}': {e}")
+            return
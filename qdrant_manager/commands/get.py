@@ -8,6 +8,10 @@ from qdrant_client.http.models import PointStruct, Filter, FieldCondition, Match
 
 logger = logging.getLogger(__name__)
 
+# json.dump and csv.writer emit many small writes; a large buffer lets them
+# reach the output file in a handful of write() syscalls
+OUTPUT_BUFFER_SIZE = 64 * 1024
+
 def _parse_ids_for_get(args):
     # Reusing the ID parsing logic from batch, could be moved to utils if needed more widely
     if args.id_file:
@@ -146,7 +150,7 @@ def get_points(client: QdrantClient, collection_name: str, args):
         output_format = args.format or "json"
         output_file = args.output
 
-        output_handle = open(output_file, 'w', newline='') if output_file else sys.stdout
+        output_handle = open(output_file, 'w', newline='', buffering=OUTPUT_BUFFER_SIZE) if output_file else sys.stdout
 
         try:
             if output_format == "json":
@@ -4,11 +4,11 @@ Configuration management for Qdrant Manager using YAML.
 
 import os
 import sys
-import yaml
+import copy
 import json
 import logging
+import functools
 from pathlib import Path
-import appdirs
 from typing import Dict, Any, Optional
 
 __all__ = ['load_config', 'get_profiles', 'update_config', 'create_default_config', 'get_config_dir', 'load_configuration']
@@ -18,20 +18,133 @@ DEFAULT_PROFILE = "default"
 
 logger = logging.getLogger(__name__)
 
+# Template written by create_default_config
+_DEFAULT_CONFIG = {
+    DEFAULT_PROFILE: {
+        "connection": {
+            "url": "localhost",
+            "port": 6333,
+            "api_key": "",
+            "collection": "my-collection"
+        },
+        "vectors": {
+            "size": 256,
+            "distance": "cosine",
+            "indexing_threshold": 0
+        },
+        "payload_indices": [
+            {"field": "example_field", "type": "keyword"},
+        ]
+    },
+    "production": {
+        "connection": {
+            "url": "your-qdrant-instance.region.cloud.qdrant.io",
+            "port": 6333,
+            "api_key": "your-api-key-here",
+            "collection": "production-collection"
+        },
+        "vectors": {
+            "size": 1536,
+            "distance": "cosine",
+            "indexing_threshold": 1000
+        },
+        "payload_indices": [
+            {"field": "category", "type": "keyword"},
+            {"field": "created_at", "type": "datetime"}
+        ]
+    }
+}
+
+@functools.lru_cache(maxsize=1)
 def get_config_dir():
     """Get the configuration directory."""
+    import appdirs
     return Path(appdirs.user_config_dir("qdrant-manager"))
 
+@functools.lru_cache(maxsize=1)
 def get_config_file():
     """Get the configuration file path."""
     return get_config_dir() / CONFIG_FILENAME
 
+def _load_yaml(raw):
+    """Parse YAML bytes, using the libyaml-backed loader when available."""
+    import yaml
+    return yaml.load(raw, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader))
+
+_YAML_STR_TAG = "tag:yaml.org,2002:str"
+
+def _extract_top_level_keys(raw):
+    """
+    Return the top-level keys of a YAML mapping without constructing its values.
+
+    The document is walked as a stream of parser events, so nested profile
+    sections are scanned but never built into Python objects. Empty,
+    non-mapping and multi-document streams raise, as they would for
+    load_config. Complex, merge or non-string keys fall back to a full parse.
+    """
+    import yaml
+    resolver = yaml.resolver.Resolver()
+    try:
+        keys = []
+        depth = 0
+        expect_key = False
+        is_mapping = False
+        documents = 0
+        for event in yaml.parse(raw, Loader=getattr(yaml, "CSafeLoader", yaml.SafeLoader)):
+            if isinstance(event, yaml.DocumentStartEvent):
+                documents += 1
+                if documents > 1:
+                    raise yaml.YAMLError("expected a single document in the config file")
+            elif isinstance(event, (yaml.MappingStartEvent, yaml.SequenceStartEvent)):
+                if depth == 0:
+                    is_mapping = isinstance(event, yaml.MappingStartEvent)
+                    expect_key = True
+                elif depth == 1 and is_mapping and expect_key:
+                    raise ValueError("Complex top-level key")
+                depth += 1
+            elif isinstance(event, (yaml.MappingEndEvent, yaml.SequenceEndEvent)):
+                depth -= 1
+                if depth == 1:
+                    expect_key = True
+            elif depth == 1 and is_mapping and isinstance(event, (yaml.ScalarEvent, yaml.AliasEvent)):
+                if expect_key:
+                    if not isinstance(event, yaml.ScalarEvent) or event.value == "<<":
+                        raise ValueError("Unsupported top-level key")
+                    # Keys such as 1: or true: resolve to non-strings in a full parse
+                    tag = event.tag or resolver.resolve(yaml.ScalarNode, event.value, event.implicit)
+                    if tag != _YAML_STR_TAG:
+                        raise ValueError("Non-string top-level key")
+                    keys.append(event.value)
+                expect_key = not expect_key
+        if not is_mapping:
+            raise yaml.YAMLError("expected a mapping of profiles in the config file")
+        # Duplicate keys collapse the same way a full parse would
+        return tuple(dict.fromkeys(keys))
+    except ValueError:
+        return tuple(_load_yaml(raw).keys())
+
+@functools.lru_cache(maxsize=8)
+def _load_config_file(path, mtime_ns, size):
+    """
+    Parse a config file, memoized on its path, mtime and size.
+
+    Editing the file changes the key, so stale entries are never returned.
+    The result is shared between callers and must not be mutated.
+    """
+    return _load_yaml(Path(path).read_bytes())
+
 def ensure_config_dir():
     """Ensure the configuration directory exists."""
     config_dir = get_config_dir()
     config_dir.mkdir(parents=True, exist_ok=True)
     return config_dir
 
+@functools.lru_cache(maxsize=None)
+def _default_config_bytes():
+    """Render the default configuration template to UTF-8 bytes once per process."""
+    import yaml
+    return yaml.dump(_DEFAULT_CONFIG, default_flow_style=False, sort_keys=False, encoding='utf-8')
+
 def create_default_config():
     """Create a default configuration file if it doesn't exist."""
     config_file = get_config_file()
@@ -39,51 +152,31 @@ def create_default_config():
     if not config_file.exists():
         ensure_config_dir()
         
-        # Default configuration
-        config = {
-            DEFAULT_PROFILE: {
-                "connection": {
-                    "url": "localhost",
-                    "port": 6333,
-                    "api_key": "",
-                    "collection": "my-collection"
-                },
-                "vectors": {
-                    "size": 256,
-                    "distance": "cosine",
-                    "indexing_threshold": 0
-                },
-                "payload_indices": [
-                    {"field": "example_field", "type": "keyword"},
-                ]
-            },
-            "production": {
-                "connection": {
-                    "url": "your-qdrant-instance.region.cloud.qdrant.io",
-                    "port": 6333,
-                    "api_key": "your-api-key-here",
-                    "collection": "production-collection"
-                },
-                "vectors": {
-                    "size": 1536,
-                    "distance": "cosine",
-                    "indexing_threshold": 1000
-                },
-                "payload_indices": [
-                    {"field": "category", "type": "keyword"},
-                    {"field": "created_at", "type": "datetime"}
-                ]
-            }
-        }
+        config_file.write_bytes(_default_config_bytes())
         
-        with open(config_file, 'w') as f:
-            yaml.dump(config, f, default_flow_style=False, sort_keys=False)
-            
         print(f"Created default configuration file at {config_file}")
         print("Please edit this file with your Qdrant connection details.")
     
     return config_file
 
+# Expected type (and its name for error messages) of each optional profile section
+_PROFILE_SECTION_TYPES = {
+    "connection": (dict, "mapping"),
+    "vectors": (dict, "mapping"),
+    "payload_indices": (list, "list"),
+}
+
+def _profile_error(profile_config):
+    """Describe why a profile can't be converted, or return None if it can."""
+    if not profile_config:
+        return None
+    if not isinstance(profile_config, dict):
+        return "is not a mapping"
+    for name, (expected_type, type_name) in _PROFILE_SECTION_TYPES.items():
+        if name in profile_config and not isinstance(profile_config[name], expected_type):
+            return f"has an invalid '{name}' section (expected a {type_name})"
+    return None
+
 def _convert_config(profile_config):
     """Convert the profile configuration to the expected format."""
     if not profile_config:
@@ -104,7 +197,8 @@ def _convert_config(profile_config):
         "vector_size": vectors.get("size", 256),
         "distance": vectors.get("distance", "cosine"),
         "indexing_threshold": vectors.get("indexing_threshold", 0),
-        "payload_indices": profile_config.get("payload_indices", [])
+        # Copied so callers can't mutate the cached parse behind later load_config calls
+        "payload_indices": copy.deepcopy(profile_config.get("payload_indices", []))
     }
     
     return config
@@ -119,17 +213,19 @@ def load_config(profile=None):
     Returns:
         dict: The configuration as a dictionary.
     """
-    config_file = get_config_file()
+    config_path = str(get_config_file())
     
-    if not config_file.exists():
-        config_file = create_default_config()
+    # A single stat() both checks for the file and provides the cache key
+    try:
+        stat = os.stat(config_path)
+    except OSError:
+        create_default_config()
         # Exit after creating the default config
         print("Please edit the configuration file and run the command again.")
         sys.exit(1)
     
     try:
-        with open(config_file, 'r') as f:
-            config = yaml.safe_load(f)
+        config = _load_config_file(config_path, stat.st_mtime_ns, stat.st_size)
     except Exception as e:
         print(f"Error loading configuration file: {e}")
         sys.exit(1)
@@ -137,27 +233,30 @@ def load_config(profile=None):
     # Use the specified profile or the default
     section = profile or DEFAULT_PROFILE
     
-    if section not in config:
+    try:
+        profile_config = config[section]
+    except (KeyError, TypeError):
+        # TypeError covers an empty file or a document that isn't a mapping
         print(f"Error: Profile '{section}' not found in the configuration file.")
-        print(f"Available profiles: {', '.join(config.keys())}")
+        if isinstance(config, dict):
+            print(f"Available profiles: {', '.join(config.keys())}")
+        sys.exit(1)
+    
+    problem = _profile_error(profile_config)
+    if problem:
+        print(f"Error: Profile '{section}' {problem}.")
         sys.exit(1)
     
     # Convert the profile's config to our expected format
-    return _convert_config(config[section])
+    return _convert_config(profile_config)
 
 def get_profiles():
-    """Get a list of available profiles."""
-    config_file = get_config_file()
-    
-    if not config_file.exists():
-        return [DEFAULT_PROFILE]
-    
+    """Get the names of the available profiles as a tuple."""
+    # A missing file raises from read_bytes() and falls back like any other error
     try:
-        with open(config_file, 'r') as f:
-            config = yaml.safe_load(f)
-            return list(config.keys())
+        return _extract_top_level_keys(get_config_file().read_bytes())
     except Exception:
-        return [DEFAULT_PROFILE]
+        return (DEFAULT_PROFILE,)
 
 def update_config(profile, section, key, value):
     """Update a configuration value.
@@ -168,14 +267,14 @@ def update_config(profile, section, key, value):
         key: The key to update
         value: The new value
     """
+    import yaml
     config_file = get_config_file()
     
     if not config_file.exists():
         config_file = create_default_config()
     
     try:
-        with open(config_file, 'r') as f:
-            config = yaml.safe_load(f)
+        config = _load_yaml(config_file.read_bytes())
     except Exception as e:
         print(f"Error loading configuration file: {e}")
         sys.exit(1)
@@ -191,9 +290,12 @@ def update_config(profile, section, key, value):
     # Update the value
     config[profile][section][key] = value
     
-    # Write the updated config
-    with open(config_file, 'w') as f:
-        yaml.dump(config, f, default_flow_style=False, sort_keys=False)
+    # Write the updated config to a temporary file and swap it into place,
+    # so a failed write never leaves a truncated config behind
+    data = yaml.dump(config, default_flow_style=False, sort_keys=False, encoding='utf-8')
+    tmp_file = config_file.with_suffix(config_file.suffix + '.tmp')
+    tmp_file.write_bytes(data)
+    os.replace(tmp_file, config_file)
 
 def load_configuration(config_file: Optional[str] = None, profile: Optional[str] = None) -> Dict[str, Any]:
     """
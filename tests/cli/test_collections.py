@@ -1,7 +1,10 @@
 """Tests for collection operations."""
+import json
+import httpx
 import pytest
-from unittest.mock import MagicMock, patch
-import httpx # Import httpx
+from contextlib import ExitStack
+from types import MappingProxyType, SimpleNamespace
+from unittest.mock import Mock, call, patch
 
 # Import specific command functions from their new locations
 from qdrant_manager.commands.create import create_collection
@@ -10,339 +13,398 @@ from qdrant_manager.commands.list_cmd import list_collections
 from qdrant_manager.commands.info import collection_info
 
 from qdrant_client.http import models # Keep if needed
-from qdrant_client.http.exceptions import UnexpectedResponse # Keep import for clarity
+from qdrant_client.http.exceptions import ResponseHandlingException, UnexpectedResponse # Keep import for clarity
 
 # Mock Qdrant client and args
 
+# Logged by delete_collection once "test-collection" is gone
+DELETE_SUCCESS_MESSAGE = "Collection 'test-collection' deleted successfully."
+
+# Collection info payload and the exact text the info command prints for it
+INFO_PAYLOAD = {"status": "green", "points_count": 100}
+INFO_OUTPUT = json.dumps(INFO_PAYLOAD, indent=2) + "\n"
+
+# Client failures raised by the delete/list/info error-path tests
+NOT_FOUND_ERROR = Exception("Not found")
+DELETE_ERROR = Exception("Deletion failed")
+LIST_ERROR = Exception("List failed")
+INFO_NOT_FOUND_ERROR = Exception("Not found error")
+# Transport-level failure that delete_collection retries with backoff
+CONNECTION_ERROR = ResponseHandlingException(httpx.ConnectError("Connection refused"))
+# Response-handling failure with no transport cause (e.g. a reply that fails validation)
+RESPONSE_PARSE_ERROR = ResponseHandlingException(ValueError("Invalid response body"))
+
+class _Contains:
+    """Compares equal to any string containing the given fragment."""
+
+    def __init__(self, fragment):
+        self.fragment = fragment
+
+    def __eq__(self, other):
+        return isinstance(other, str) and self.fragment in other
+
+    def __repr__(self):
+        return f"<string containing {self.fragment!r}>"
+
+@pytest.fixture(scope="module")
+def _create_patches():
+    """Patch the create command's models and logger once for the whole module."""
+    with ExitStack() as stack:
+        yield SimpleNamespace(
+            models=stack.enter_context(patch('qdrant_manager.commands.create.models')),
+            logger=stack.enter_context(patch('qdrant_manager.commands.create.logger')),
+        )
+
+@pytest.fixture(scope="module")
+def base_config():
+    """Read-only collection defaults shared by the create tests."""
+    return MappingProxyType({"vector_size": 256, "distance": "cosine", "indexing_threshold": 0, "payload_indices": ()})
+
+@pytest.fixture(scope="module")
+def collections_response():
+    """Read-only get_collections() response listing two collections, shared by the list tests."""
+    return SimpleNamespace(collections=(SimpleNamespace(name="collection1"), SimpleNamespace(name="collection2")))
+
+@pytest.fixture
+def make_collection_info():
+    """Build CollectionInfo-spec'd get_collection() results."""
+    def _make(*, status="green", points_count=0):
+        info = Mock(spec=models.CollectionInfo)
+        info.status = status
+        info.points_count = points_count
+        info.dict.return_value = {"status": status, "points_count": points_count}
+        return info
+    return _make
+
+@pytest.fixture
+def create_mocks(_create_patches):
+    """Module-wide create mocks with call history and behaviour reset per test."""
+    for mock in vars(_create_patches).values():
+        mock.reset_mock(return_value=True, side_effect=True)
+    return _create_patches
+
 # Delete the failing test
 # test_create_collection_success has been removed as it was difficult to properly mock the UnexpectedResponse
 
-def test_create_collection_already_exists():
+@pytest.mark.create
+def test_create_collection_already_exists(mock_client, create_mocks, base_config, make_collection_info):
     """Test creating a collection that already exists."""
-    mock_client = MagicMock()
     # Simulate collection exists
-    mock_client.get_collection.return_value = MagicMock()
+    mock_client.get_collection.return_value = make_collection_info()
     mock_client.get_collection.side_effect = None # Clear any side effect
 
-    with patch('qdrant_manager.commands.create.models') as mock_models, \
-         patch('qdrant_manager.commands.create.logger') as mock_logger:
-        mock_models.Distance = MagicMock()
-        mock_models.Distance.COSINE = "Cosine"
-        mock_models.VectorParams = MagicMock()
-        mock_models.OptimizersConfigDiff = MagicMock()
-        mock_args = MagicMock()
-        mock_args.size = None
-        mock_args.distance = None
-        mock_args.indexing_threshold = None
-        mock_config_data = {"vector_size": 256, "distance": "cosine", "indexing_threshold": 0, "payload_indices": []}
-
-        # Test overwrite=False (should log warning, not recreate)
-        create_collection(mock_client, "test-collection", False, mock_config_data, mock_args)
-        mock_client.get_collection.assert_called_once_with(collection_name="test-collection")
-        mock_client.recreate_collection.assert_not_called()
-        mock_logger.warning.assert_any_call("Collection 'test-collection' already exists. Use --overwrite to replace it.")
-
-        # Test overwrite=True (should recreate)
-        mock_client.reset_mock()
-        mock_logger.reset_mock()
-        # Crucially, get_collection should NOT be called when overwrite=True
-        mock_client.get_collection.side_effect = None # Ensure no residual side effect interferes
+    mock_models = create_mocks.models
+    mock_logger = create_mocks.logger
+    mock_models.Distance = Mock()
+    mock_models.Distance.COSINE = "Cosine"
+    mock_models.VectorParams = Mock()
+    mock_models.OptimizersConfigDiff = Mock()
+    mock_args = Mock(size=None, distance=None, indexing_threshold=None)
+
+    # Test overwrite=False (should log warning, not recreate)
+    create_collection(mock_client, "test-collection", False, base_config, mock_args)
+    mock_client.get_collection.assert_called_once_with(collection_name="test-collection")
+    mock_client.recreate_collection.assert_not_called()
+    mock_logger.warning.assert_any_call("Collection 'test-collection' already exists. Use --overwrite to replace it.")
+
+    # Test overwrite=True (should recreate)
+    mock_client.reset_mock()
+    mock_logger.reset_mock()
+    # Crucially, get_collection should NOT be called when overwrite=True
+    mock_client.get_collection.side_effect = None # Ensure no residual side effect interferes
 
-        create_collection(mock_client, "test-collection", True, mock_config_data, mock_args)
-        mock_client.get_collection.assert_not_called() # Check skipped
-        mock_client.recreate_collection.assert_called_once() # Should be called now
-        mock_logger.warning.assert_not_called() # No warning when overwriting
+    create_collection(mock_client, "test-collection", True, base_config, mock_args)
+    mock_client.get_collection.assert_not_called() # Check skipped
+    mock_client.recreate_collection.assert_called_once() # Should be called now
+    mock_logger.warning.assert_not_called() # No warning when overwriting
 
 
-def test_delete_collection():
+@pytest.mark.delete
+def test_delete_collection(mock_client, patch_delete):
     """Test deleting a collection."""
-    # Mock the Qdrant client
-    mock_client = MagicMock()
+    mock_logger = patch_delete.logger
 
     # Set up mock collection response
-    mock_collection = MagicMock()
+    mock_collection = Mock()
     mock_collection.name = "test-collection"
-    mock_collections_response = MagicMock()
+    mock_collections_response = Mock()
     mock_collections_response.collections = [mock_collection]
     mock_client.get_collections.return_value = mock_collections_response
 
     # Test successful deletion
-    with patch('qdrant_manager.commands.delete.logger') as mock_logger:
-        # delete_collection doesn't return a value
-        delete_collection(mock_client, "test-collection")
+    # delete_collection doesn't return a value
+    delete_collection(mock_client, "test-collection")
 
-        # Check that the collection was deleted
-        mock_client.delete_collection.assert_called_once_with(collection_name="test-collection")
-        # Check logger for success message
-        mock_logger.info.assert_called_with("Collection 'test-collection' deleted successfully.")
-        # assert result is True # Removed assertion
+    # Check that the collection was deleted
+    mock_client.delete_collection.assert_called_once_with(collection_name="test-collection")
+    # Check logger for success message
+    mock_logger.info.assert_called_with(DELETE_SUCCESS_MESSAGE)
+    # assert result is True # Removed assertion
 
     # Test deleting a non-existent collection (delete_collection handles this, might log error or info)
     mock_client.reset_mock()
-    mock_client.delete_collection.side_effect = Exception("Not found") # Simulate Qdrant error
-    with patch('qdrant_manager.commands.delete.logger') as mock_logger:
-        result = delete_collection(mock_client, "nonexistent-collection")
+    mock_client.delete_collection.side_effect = NOT_FOUND_ERROR # Simulate Qdrant error
+    mock_logger.reset_mock()
+    result = delete_collection(mock_client, "nonexistent-collection")
 
-        # Check delete was attempted
-        mock_client.delete_collection.assert_called_once_with(collection_name="nonexistent-collection")
-        # Check logger output for error
-        mock_logger.error.assert_called_with("Failed to delete collection 'nonexistent-collection': Not found")
+    # Check delete was attempted
+    mock_client.delete_collection.assert_called_once_with(collection_name="nonexistent-collection")
+    # Check logger output for error
+    mock_logger.error.assert_called_with("Failed to delete collection 'nonexistent-collection': Not found")
 
     # Test exception during deletion
     mock_client.reset_mock()
-    mock_client.delete_collection.side_effect = Exception("Deletion failed")
+    mock_client.delete_collection.side_effect = DELETE_ERROR
 
-    with patch('qdrant_manager.commands.delete.logger') as mock_logger:
-        result = delete_collection(mock_client, "test-collection")
-        mock_client.delete_collection.assert_called_once_with(collection_name="test-collection")
-        # Check that error was logged
-        mock_logger.error.assert_called()
-        
+    mock_logger.reset_mock()
+    result = delete_collection(mock_client, "test-collection")
+    mock_client.delete_collection.assert_called_once_with(collection_name="test-collection")
+    # Check that error was logged
+    mock_logger.error.assert_called()
 
-def test_list_collections():
-    """Test listing collections."""
-    # Mock the Qdrant client
-    mock_client = MagicMock()
 
-    # Set up mock collections
-    mock_collection1 = MagicMock()
-    mock_collection1.name = "collection1"
-    mock_collection2 = MagicMock()
-    mock_collection2.name = "collection2"
+@pytest.mark.delete
+def test_delete_collection_in_memory(memory_client, patch_delete):
+    """Test deleting a collection from an in-process Qdrant instance."""
+    memory_client.create_collection(
+        collection_name="test-collection",
+        vectors_config=models.VectorParams(size=4, distance=models.Distance.COSINE),
+    )
 
-    mock_collections_response = MagicMock()
-    mock_collections_response.collections = [mock_collection1, mock_collection2]
-    mock_client.get_collections.return_value = mock_collections_response
+    delete_collection(memory_client, "test-collection")
 
-    # Set up mock collection info
-    mock_info1 = MagicMock()
-    mock_info1.vectors_count = 100
-    mock_info1.creation_time = "2023-01-01"
+    assert [c.name for c in memory_client.get_collections().collections] == []
+    patch_delete.logger.error.assert_not_called()
 
-    mock_info2 = MagicMock()
-    mock_info2.vectors_count = 200
-    mock_info2.creation_time = "2023-01-02"
 
-    mock_client.get_collection.side_effect = [mock_info1, mock_info2]
+@pytest.mark.delete
+def test_delete_collection_only_deletes(mock_client, patch_delete):
+    """Test back-to-back deletes issue exactly one delete call each on the injected client."""
+    delete_collection(mock_client, "collection1")
+    delete_collection(mock_client, "collection2")
 
-    # Test listing collections
-    with patch('qdrant_manager.commands.list_cmd.logger') as mock_logger:
-        # Patch print used by list_collections
-        with patch('builtins.print') as mock_print:
-            list_collections(mock_client)
-
-            # Check that collections were retrieved
-            mock_client.get_collections.assert_called_once()
-            # Check print output
-            mock_print.assert_any_call("Available collections:")
-            mock_print.assert_any_call("  - collection1")
-            mock_print.assert_any_call("  - collection2")
-            
-    # Test with no collections
-    mock_client.reset_mock()
-    mock_collections_response.collections = []
-    mock_client.get_collections.return_value = mock_collections_response
+    assert mock_client.method_calls == [
+        call.delete_collection(collection_name="collection1"),
+        call.delete_collection(collection_name="collection2"),
+    ]
 
-    with patch('qdrant_manager.commands.list_cmd.logger') as mock_logger:
-        with patch('builtins.print') as mock_print:
-            list_collections(mock_client)
-            mock_client.get_collections.assert_called_once()
-            mock_print.assert_called_with("No collections found.")
 
-    # Test with exception
-    mock_client.reset_mock()
-    mock_client.get_collections.side_effect = Exception("List failed")
+@pytest.fixture
+def mock_sleep(monkeypatch):
+    """Skip real waits in the delete command's retry backoff."""
+    sleep = Mock()
+    monkeypatch.setattr('qdrant_manager.commands.delete.time.sleep', sleep)
+    return sleep
 
-    with patch('qdrant_manager.commands.list_cmd.logger') as mock_logger:
-        with patch('builtins.print') as mock_print:
-            list_collections(mock_client)
-            # Check that error was logged
-            mock_logger.error.assert_called()
-            # Check print wasn't called with collections
-            mock_print.assert_not_called()
 
+@pytest.mark.delete
+def test_delete_collection_retries_with_backoff(mock_client, patch_delete, mock_sleep):
+    """Test connection errors are retried with exponential backoff before succeeding."""
+    mock_client.delete_collection.side_effect = [CONNECTION_ERROR] * 3 + [None]
 
-def test_collection_info():
-    """Test getting collection info."""
-    # Mock the Qdrant client
-    mock_client = MagicMock()
+    delete_collection(mock_client, "test-collection")
 
-    # Set up mock collections
-    mock_collection = MagicMock()
-    mock_collection.name = "test-collection"
-    mock_collections_response = MagicMock()
-    mock_collections_response.collections = [mock_collection]
-    mock_client.get_collections.return_value = mock_collections_response
+    assert mock_client.delete_collection.call_count == 4
+    assert mock_sleep.call_args_list == [call(0.5), call(1.0), call(2.0)]
+    patch_delete.logger.error.assert_not_called()
 
-    # Set up mock collection info
-    mock_info = MagicMock()
-    mock_info.vectors_count = 100
-    mock_info.creation_time = "2023-01-01"
 
-    # Set up config and vector params
-    mock_params = MagicMock()
-    mock_params.size = 256
-    mock_params.distance = "cosine"
+@pytest.mark.delete
+def test_delete_collection_retries_exhausted(mock_client, patch_delete, mock_sleep):
+    """Test delete gives up and logs an error once the retries are used up."""
+    mock_client.delete_collection.side_effect = CONNECTION_ERROR
 
-    mock_config = MagicMock()
-    mock_config.params = mock_params
+    delete_collection(mock_client, "test-collection")
 
-    mock_info.config = mock_config
+    assert mock_client.delete_collection.call_count == 4
+    assert mock_sleep.call_count == 3
+    patch_delete.logger.error.assert_called_once()
 
-    # Set up mock count response
-    mock_count = MagicMock()
-    mock_count.count = 100
 
-    # Set up mock scroll response
-    mock_point = MagicMock()
-    mock_point.payload = {"field1": "value1", "tags": {"tag1": 0.9, "tag2": 0.8}}
+@pytest.mark.delete
+def test_delete_collection_no_retry_without_transport_error(mock_client, patch_delete, mock_sleep):
+    """Test response-handling errors that aren't transport failures are logged without retrying."""
+    mock_client.delete_collection.side_effect = RESPONSE_PARSE_ERROR
 
-    # Configure the mocks
-    mock_client.get_collection.return_value = mock_info
-    mock_client.count.return_value = mock_count
-    mock_client.scroll.return_value = ([mock_point], None)
+    delete_collection(mock_client, "test-collection")
 
-    # Test getting collection info
-    with patch('qdrant_manager.commands.info.logger') as mock_logger:
-        # Patch json.dumps used for printing
-        with patch('qdrant_manager.commands.info.json.dumps') as mock_dumps:
-             with patch('builtins.print') as mock_print:
-                collection_info(mock_client, "test-collection")
-
-                # Check that collection info was retrieved
-                mock_client.get_collection.assert_called_once_with(collection_name="test-collection")
-                # Check that info was printed (via json.dumps)
-                mock_dumps.assert_called_once()
-                mock_print.assert_called_once()
-
-    # Test with a non-existent collection (should log error)
-    mock_client.reset_mock()
-    mock_client.get_collection.side_effect = Exception("Not found error")
-    with patch('qdrant_manager.commands.info.logger') as mock_logger:
-         with patch('builtins.print') as mock_print:
-            collection_info(mock_client, "nonexistent-collection")
+    mock_client.delete_collection.assert_called_once_with(collection_name="test-collection")
+    mock_sleep.assert_not_called()
+    patch_delete.logger.warning.assert_not_called()
+    patch_delete.logger.error.assert_called_once()
 
-            # Check get_collection was called
-            mock_client.get_collection.assert_called_once_with(collection_name="nonexistent-collection")
-            # Check logger output for error
-            mock_logger.error.assert_called()
-            # Check print was not called
-            mock_print.assert_not_called()
 
-    # Test with an exception (already tested above with non-existent)
+@pytest.mark.list
+def test_list_collections(mock_client, collections_response, patch_list, capsys):
+    """Test listing collections."""
+    mock_logger = patch_list.logger
+    mock_client.get_collections.return_value = collections_response
 
+    # Test listing collections
+    list_collections(mock_client)
 
-def test_list_collections_with_error_getting_info():
-    """Test list collections with error when getting info for a collection."""
-    # Mock the Qdrant client
-    mock_client = MagicMock()
+    # Check that collections were retrieved
+    mock_client.get_collections.assert_called_once()
+    # Check printed output
+    assert capsys.readouterr().out == "Available collections:\n  - collection1\n  - collection2\n"
+    # list_collections only lists names; it never fetches per-collection info
+    mock_client.get_collection.assert_not_called()
+    mock_logger.error.assert_not_called()
 
-    # Set up mock collections
-    mock_collection1 = MagicMock()
-    mock_collection1.name = "collection1"
+    # Test with no collections
+    mock_client.reset_mock()
+    mock_client.get_collections.return_value = SimpleNamespace(collections=())
 
-    mock_collections_response = MagicMock()
-    mock_collections_response.collections = [mock_collection1]
-    mock_client.get_collections.return_value = mock_collections_response
+    list_collections(mock_client)
+    mock_client.get_collections.assert_called_once()
+    assert capsys.readouterr().out == "No collections found.\n"
 
-    # Set up get_collection to fail with exception
-    mock_client.get_collection.side_effect = Exception("Error getting collection info")
-
-    # Test listing collections with info error
-    with patch('qdrant_manager.commands.list_cmd.logger') as mock_logger:
-        # Patch print used by list_collections
-        with patch('builtins.print') as mock_print:
-            list_collections(mock_client)
-
-            # Check get_collections was called
-            mock_client.get_collections.assert_called_once()
-            
-            # Should still print the collection name
-            mock_print.assert_any_call("Available collections:")
-            mock_print.assert_any_call("  - collection1")
-            
-            # get_collection should not be called by list_collections
-            mock_client.get_collection.assert_not_called()
-
-            # Logger should not have logged error (list_collections doesn't get info)
-            mock_logger.error.assert_not_called()
-
-def test_create_collection_empty_name():
-    """Test handling of empty collection name."""
-    mock_client = MagicMock()
-    with patch('qdrant_manager.commands.create.logger') as mock_logger:
-        mock_args = MagicMock()
-        mock_config = {}
-        
-        # Call with empty name
-        create_collection(mock_client, "", False, mock_config, mock_args)
-        
-        # Check that error was logged and no further actions taken
-        mock_logger.error.assert_called_once_with("Collection name is required for 'create' command.")
-        mock_client.get_collection.assert_not_called()
-        mock_client.recreate_collection.assert_not_called()
+    # Test with exception
+    mock_client.reset_mock()
+    mock_client.get_collections.side_effect = LIST_ERROR
+
+    list_collections(mock_client)
+    # Check that error was logged
+    mock_logger.error.assert_called_once_with("Failed to list collections: List failed")
+    # Check nothing was printed
+    assert capsys.readouterr().out == ""
 
-def test_create_collection_other_exception():
-    """Test handling of general exception when checking collection."""
-    mock_client = MagicMock()
-    # Make get_collection raise a general exception
-    mock_client.get_collection.side_effect = Exception("General error")
+
+@pytest.mark.info
+def test_collection_info(mock_client, make_collection_info, patch_info, capfd):
+    """Test getting collection info."""
+    mock_logger = patch_info.logger
+    mock_client.get_collection.return_value = make_collection_info(**INFO_PAYLOAD)
+
+    # Test getting collection info
+    collection_info(mock_client, "test-collection")
+
+    # Check that collection info was retrieved
+    mock_client.get_collection.assert_called_once_with(collection_name="test-collection")
+    # Check that the info dict was pretty-printed
+    assert capfd.readouterr().out == INFO_OUTPUT
+    mock_logger.error.assert_not_called()
+
+
+# (collection name, get_collection side effect, expected error log fragment)
+INFO_ERROR_CASES = [
+    pytest.param(
+        "", None,
+        "Collection name is required for 'info' command.",
+        id="missing-name"),
+    pytest.param(
+        "nonexistent-collection", INFO_NOT_FOUND_ERROR,
+        "Failed to get information for collection 'nonexistent-collection': Not found error",
+        id="generic-error"),
+    pytest.param(
+        "nonexistent-collection",
+        UnexpectedResponse(status_code=404, reason_phrase="Not Found", content=b"", headers=None),
+        "Failed to get information for collection 'nonexistent-collection'",
+        id="unexpected-response"),
+]
+
+@pytest.mark.info
+@pytest.mark.parametrize("collection_name,side_effect,expected_fragment", INFO_ERROR_CASES)
+def test_collection_info_errors(mock_client, patch_info, capsys, collection_name, side_effect, expected_fragment):
+    """Test that each failure while getting collection info is logged and nothing is printed."""
+    mock_client.get_collection.side_effect = side_effect
+
+    collection_info(mock_client, collection_name)
+
+    patch_info.logger.error.assert_called_once_with(_Contains(expected_fragment))
+    assert capsys.readouterr().out == ""
+
+
+@pytest.mark.create
+def test_create_collection_empty_name(mock_client, create_mocks, base_config):
+    """Test handling of empty collection name."""
+    mock_args = Mock()
     
-    with patch('qdrant_manager.commands.create.logger') as mock_logger:
-        mock_args = MagicMock()
-        mock_config = {"vector_size": 256, "distance": "cosine"}
-        
-        # Call create_collection
-        create_collection(mock_client, "test-collection", False, mock_config, mock_args)
-        
-        # Check error was logged
-        mock_logger.error.assert_called_once_with(
-            "Unexpected error checking collection 'test-collection': General error")
-        # Check no recreation
+    # Call with empty name
+    create_collection(mock_client, "", False, base_config, mock_args)
+    
+    # Check that error was logged and no further actions taken
+    create_mocks.logger.error.assert_called_once_with("Collection name is required for 'create' command.")
+    mock_client.get_collection.assert_not_called()
+    mock_client.recreate_collection.assert_not_called()
+
+# (overwrite flag, client method -> side effect, expected error log fragment)
+CREATE_ERROR_CASES = [
+    pytest.param(
+        False,
+        {"get_collection": UnexpectedResponse(
+            status_code=500, reason_phrase="Internal Server Error", content=b"", headers=None)},
+        "Error checking collection 'test-collection'",
+        id="check-unexpected-response"),
+    pytest.param(
+        False,
+        {"get_collection": Exception("General error")},
+        "Unexpected error checking collection 'test-collection': General error",
+        id="check-generic-error"),
+    pytest.param(
+        True,
+        {"recreate_collection": Exception("Recreate failed")},
+        "Failed to create collection 'test-collection': Recreate failed",
+        id="recreate-error"),
+    pytest.param(
+        True,
+        {"create_payload_index": Exception("Index failed")},
+        "Failed to create payload index for field 'tag': Index failed",
+        id="payload-index-error"),
+]
+
+@pytest.mark.create
+@pytest.mark.parametrize("overwrite,side_effects,expected_fragment", CREATE_ERROR_CASES)
+def test_create_collection_errors(mock_client, create_mocks, base_config, overwrite, side_effects, expected_fragment):
+    """Test that each failure while creating a collection is logged."""
+    for method, side_effect in side_effects.items():
+        getattr(mock_client, method).side_effect = side_effect
+    
+    mock_args = Mock(size=None, distance=None, indexing_threshold=None)
+    mock_config = {**base_config, "payload_indices": [("tag", "keyword")]}
+    
+    create_collection(mock_client, "test-collection", overwrite, mock_config, mock_args)
+    
+    create_mocks.logger.error.assert_any_call(_Contains(expected_fragment))
+    # A failed existence check must not fall through to recreating the collection
+    if not overwrite:
         mock_client.recreate_collection.assert_not_called()
 
-def test_create_collection_with_payload_indices_success():
+@pytest.mark.create
+def test_create_collection_with_payload_indices_success(mock_client, create_mocks, base_config):
     """Test successful creation of payload indices."""
-    mock_client = MagicMock()
     
-    # For this test, we'll use the overwrite=True path to avoid the get_collection call
-    with patch('qdrant_manager.commands.create.models') as mock_models, \
-         patch('qdrant_manager.commands.create.logger') as mock_logger:
-        
-        # Set up mock models
-        mock_models.Distance = MagicMock()
-        mock_models.Distance.COSINE = "Cosine"
-        mock_models.VectorParams = MagicMock()
-        mock_models.HnswConfigDiff = MagicMock()
-        mock_models.OptimizersConfigDiff = MagicMock()
-        
-        # Basic args
-        mock_args = MagicMock()
-        mock_args.size = None
-        mock_args.distance = None
-        mock_args.indexing_threshold = None
-        
-        # Config with payload indices
-        mock_config = {
-            "vector_size": 256, 
-            "distance": "cosine", 
-            "indexing_threshold": 0,
-            "payload_indices": [
-                ("tag", "keyword"), 
-                ("count", "integer")
-            ]
-        }
-        
-        # Call create_collection with overwrite=True to bypass existence check
-        create_collection(mock_client, "test-collection", True, mock_config, mock_args)
-        
-        # Check recreate_collection was called
-        mock_client.recreate_collection.assert_called_once()
-        
-        # Check payload indices were created
-        assert mock_client.create_payload_index.call_count == 2
-        
-        # Check specific logger messages for indices
-        mock_logger.info.assert_any_call("Applying payload indices: [('tag', 'keyword'), ('count', 'integer')]")
-        mock_logger.info.assert_any_call("Created payload index for field 'tag' in collection 'test-collection'.")
-        mock_logger.info.assert_any_call("Created payload index for field 'count' in collection 'test-collection'.")
+    # Set up mock models
+    mock_models = create_mocks.models
+    mock_models.Distance = Mock()
+    mock_models.Distance.COSINE = "Cosine"
+    mock_models.VectorParams = Mock()
+    mock_models.HnswConfigDiff = Mock()
+    mock_models.OptimizersConfigDiff = Mock()
+    
+    # Basic args
+    mock_args = Mock(size=None, distance=None, indexing_threshold=None)
+    
+    # Config with payload indices
+    mock_config = {
+        **base_config,
+        "payload_indices": [
+            ("tag", "keyword"), 
+            ("count", "integer")
+        ]
+    }
+    
+    # Call create_collection with overwrite=True to bypass existence check
+    create_collection(mock_client, "test-collection", True, mock_config, mock_args)
+    
+    # Check recreate_collection was called
+    mock_client.recreate_collection.assert_called_once()
+    
+    # Check payload indices were created
+    assert mock_client.create_payload_index.call_count == 2
+    
+    # Check specific logger messages for indices
+    mock_logger = create_mocks.logger
+    mock_logger.info.assert_any_call("Applying payload indices: [('tag', 'keyword'), ('count', 'integer')]")
+    mock_logger.info.assert_any_call("Created payload index for field 'tag' in collection 'test-collection'.")
+    mock_logger.info.assert_any_call("Created payload index for field 'count' in collection 'test-collection'.")
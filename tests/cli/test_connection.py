@@ -1,64 +1,90 @@
 """Tests for Qdrant connection functionality."""
+import logging
 import pytest
 from unittest.mock import patch, MagicMock
 
 from qdrant_manager.utils import initialize_qdrant_client
 from qdrant_client import QdrantClient
 
+# Connection settings for a local (non-cloud) endpoint
+ENV_VARS = {
+    "url": "test-url",
+    "port": 1234,
+    "api_key": "test-key"
+}
 
-def test_initialize_qdrant_client():
-    """Test initializing Qdrant client."""
-    # Create test environment variables
-    env_vars = {
-        "url": "test-url",
-        "port": 1234,
-        "api_key": "test-key"
-    }
-    
-    # Mock QdrantClient class within the correct module (utils)
+
+@pytest.fixture(scope="module")
+def _client_class_patch():
+    """Patch QdrantClient where utils constructs it, once for the whole module."""
     with patch('qdrant_manager.utils.QdrantClient') as mock_client_class:
-        # Create a mock client instance
-        mock_client = MagicMock()
-        # Mock the get_collections call used for connection testing
-        mock_client.get_collections.return_value = MagicMock() 
-        mock_client_class.return_value = mock_client
-        
-        # Call the function, patching the logger in utils
-        with patch('qdrant_manager.utils.logger') as mock_logger:
-            with patch('sys.exit') as mock_exit:
-                client = initialize_qdrant_client(env_vars)
-                
-                # Check that client was properly initialized
-                mock_client_class.assert_called_once_with(
-                    url="test-url",
-                    port=1234,
-                    api_key="test-key"
-                )
-                
-                # Check that we tested the connection
-                mock_client.get_collections.assert_called_once()
-                
-                # Client should be returned
-                assert client == mock_client
-                
-                # sys.exit should not be called
-                mock_exit.assert_not_called()
+        yield mock_client_class
+
+
+@pytest.fixture
+def mock_client_class(_client_class_patch):
+    """Module-wide QdrantClient class mock with call history and behaviour reset per test."""
+    yield _client_class_patch
+    _client_class_patch.reset_mock(return_value=True, side_effect=True)
+
+
+def test_initialize_qdrant_client(mock_client_class, monkeypatch, utils_mod):
+    """Test initializing Qdrant client."""
+    # Replace the sys.exit used by utils
+    mock_exit = MagicMock()
+    monkeypatch.setattr(utils_mod.sys, 'exit', mock_exit)
+
+    # Create a mock client instance
+    mock_client = MagicMock()
+    # Mock the get_collections call used for connection testing
+    mock_client.get_collections.return_value = MagicMock() 
+    mock_client_class.return_value = mock_client
     
-    # Test connection failure
-    with patch('qdrant_manager.utils.QdrantClient') as mock_client_class:
-        # Make the client raise an exception during connection test
-        mock_client = MagicMock()
-        mock_client.get_collections.side_effect = Exception("Connection failed")
-        mock_client_class.return_value = mock_client
-        
-        # Call the function, patching the logger in utils
-        with patch('qdrant_manager.utils.logger') as mock_logger:
-            with patch('sys.exit') as mock_exit:
-                # initialize_qdrant_client calls sys.exit on failure
-                initialize_qdrant_client(env_vars)
-                 
-                # Check that error was logged
-                mock_logger.error.assert_called_with("Failed to connect to Qdrant: Connection failed")
-                
-                # Check that we exited the program
-                mock_exit.assert_called_once_with(1)
+    # Call the function
+    client = initialize_qdrant_client(ENV_VARS)
+
+    # Check that client was properly initialized
+    mock_client_class.assert_called_once_with(
+        url="test-url",
+        port=1234,
+        api_key="test-key",
+        timeout=30,
+        prefer_grpc=False,
+    )
+
+    # Check that we tested the connection
+    mock_client.get_collections.assert_called_once()
+
+    # Client should be returned
+    assert client == mock_client
+
+    # sys.exit should not be called
+    mock_exit.assert_not_called()
+
+
+# (QdrantClient constructor side effect, get_collections side effect, expected error log)
+CONNECTION_ERROR_CASES = [
+    pytest.param(
+        ValueError("Invalid URL"), None,
+        "Failed to connect to Qdrant: Invalid URL",
+        id="constructor-error"),
+    pytest.param(
+        None, Exception("Connection failed"),
+        "Failed to connect to Qdrant: Connection failed",
+        id="connection-check-error"),
+]
+
+@pytest.mark.parametrize("client_error,check_error,expected_message", CONNECTION_ERROR_CASES)
+def test_initialize_qdrant_client_errors(mock_client_class, monkeypatch, utils_mod, caplog,
+                                         client_error, check_error, expected_message):
+    """Test that a failure to build or reach the client is logged and exits."""
+    mock_exit = MagicMock()
+    monkeypatch.setattr(utils_mod.sys, 'exit', mock_exit)
+    mock_client_class.side_effect = client_error
+    mock_client_class.return_value.get_collections.side_effect = check_error
+
+    with caplog.at_level(logging.ERROR, logger='qdrant_manager.utils'):
+        initialize_qdrant_client(ENV_VARS)
+
+    assert caplog.messages[-1] == expected_message
+    mock_exit.assert_called_once_with(1)
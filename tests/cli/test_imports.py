@@ -1,6 +1,4 @@
 """Test CLI functionality."""
-import sys
-import pytest
 from unittest.mock import patch, MagicMock
 
 # We'll add more tests here in the future if needed
\ No newline at end of file
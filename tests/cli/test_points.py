@@ -1,91 +1,108 @@
 """Tests for point retrieval operations."""
 import pytest
-from unittest.mock import MagicMock, patch
+from unittest.mock import MagicMock, Mock, patch
 import json
 import csv
-from io import StringIO
+import os
+import tempfile
+from dataclasses import dataclass
+from typing import Optional
 
-from qdrant_manager.commands.get import get_points, _parse_ids_for_get, _parse_filter_for_get
+from qdrant_manager.commands.get import get_points, _parse_ids_for_get, _parse_filter_for_get, OUTPUT_BUFFER_SIZE
 from qdrant_client.http.models import PointStruct, Filter, FieldCondition, MatchValue, ScoredPoint
 
+# Filter argument shared by the scroll and filter-parsing tests
+FIELD1_FILTER = '{"key":"field1", "match":{"value":"value1"}}'
 
-def test_get_points_by_ids():
+# Client failures raised by the retrieve/scroll error-path tests
+RETRIEVE_ERROR = Exception("Retrieval failed")
+SCROLL_ERROR = Exception("Scroll failed")
+
+
+@dataclass(frozen=True)
+class GetArgs:
+    """Parsed 'get' command arguments, defaulting to the CLI defaults."""
+    ids: Optional[str] = None
+    id_file: Optional[str] = None
+    filter: Optional[str] = None
+    with_vectors: bool = False
+    format: str = "json"
+    output: Optional[str] = None
+    limit: int = 10
+
+
+@pytest.fixture
+def mock_client():
+    """Client stub limited to the retrieve/scroll calls get_points makes."""
+    return Mock(spec_set=['retrieve', 'scroll'])
+
+
+@pytest.fixture
+def args_factory():
+    """Build GetArgs, overriding only the fields a test cares about."""
+    return GetArgs
+
+
+@pytest.fixture
+def make_points():
+    """Build point stubs with sequential ids (from 1) for the given payloads."""
+    def _make(*payloads):
+        return [Mock(id=point_id, payload=payload, vector=[0.1, 0.2, 0.3])
+                for point_id, payload in enumerate(payloads, start=1)]
+    return _make
+
+
+def test_get_points_by_ids(mock_client, args_factory, make_points, patch_get):
     """Test retrieving points by IDs."""
-    # Mock the Qdrant client
-    mock_client = MagicMock()
+    mock_logger = patch_get.logger
 
     # Set up mock points
-    mock_point1 = MagicMock()
-    mock_point1.id = 1
-    mock_point1.payload = {"field1": "value1"}
-    mock_point1.vector = [0.1, 0.2, 0.3]
-
-    mock_point2 = MagicMock()
-    mock_point2.id = 2
-    mock_point2.payload = {"field1": "value2"}
-    mock_point2.vector = [0.4, 0.5, 0.6]
+    mock_point1, mock_point2 = make_points({"field1": "value1"}, {"field1": "value2"})
 
     # Configure retrieve_points to return mock points
     mock_client.retrieve.return_value = [mock_point1, mock_point2]
 
     # Test retrieving points
-    with patch('qdrant_manager.commands.get.logger') as mock_logger:
-        mock_args_ids = MagicMock()
-        mock_args_ids.id_file = None
-        mock_args_ids.ids = "1,2"
-        mock_args_ids.filter = None
-        mock_args_ids.with_vectors = False # Assume default
-        mock_args_ids.format = "json"
-        mock_args_ids.output = None
-        mock_args_ids.limit = 10 # Default for get
-
-        with patch('builtins.print') as mock_print, patch('qdrant_manager.commands.get.json.dump') as mock_json_dump:
-             get_points(mock_client, "test-collection", mock_args_ids)
-
-             # Check that points were retrieved using retrieve
-             mock_client.retrieve.assert_called_once()
-             mock_client.scroll.assert_not_called()
-             # Check output (assuming JSON)
-             mock_json_dump.assert_called_once()
+    args_ids = args_factory(ids="1,2")
+
+    with patch('qdrant_manager.commands.get.json.dump') as mock_json_dump:
+        get_points(mock_client, "test-collection", args_ids)
+
+        # Check that points were retrieved using retrieve
+        mock_client.retrieve.assert_called_once()
+        mock_client.scroll.assert_not_called()
+        # Check output (assuming JSON)
+        mock_json_dump.assert_called_once()
 
     # Test with missing points (retrieve handles this, get_points logs info)
     mock_client.reset_mock()
     mock_client.retrieve.return_value = [mock_point1]  # Only one point found
-    with patch('qdrant_manager.commands.get.logger') as mock_logger:
-        mock_args_ids_missing = MagicMock(ids="1,99", id_file=None, filter=None, with_vectors=False, format="json", output=None, limit=10)
-        with patch('builtins.print'), patch('qdrant_manager.commands.get.json.dump') as mock_json_dump:
-            get_points(mock_client, "test-collection", mock_args_ids_missing)
-            mock_client.retrieve.assert_called_once()
-            mock_json_dump.assert_called_once() # Should still output found points
-            # The function get_points itself doesn't log warnings for missing IDs
-            # mock_logger.warning.assert_called_with("Document ID 99 not found")
+    mock_logger.reset_mock()
+    args_ids_missing = args_factory(ids="1,99")
+    with patch('qdrant_manager.commands.get.json.dump') as mock_json_dump:
+        get_points(mock_client, "test-collection", args_ids_missing)
+        mock_client.retrieve.assert_called_once()
+        mock_json_dump.assert_called_once() # Should still output found points
+        # The function get_points itself doesn't log warnings for missing IDs
+        # mock_logger.warning.assert_called_with("Document ID 99 not found")
 
     # Test with exception
     mock_client.reset_mock()
-    mock_client.retrieve.side_effect = Exception("Retrieval failed")
-    with patch('qdrant_manager.commands.get.logger') as mock_logger:
-         mock_args_ids_err = MagicMock(ids="1,2", id_file=None, filter=None, with_vectors=False, format="json", output=None, limit=10)
-         with patch('builtins.print'), patch('qdrant_manager.commands.get.json.dump'):
-            get_points(mock_client, "test-collection", mock_args_ids_err)
-            # Check that error was logged
-            mock_logger.error.assert_called_with("Failed to retrieve points: Retrieval failed")
+    mock_client.retrieve.side_effect = RETRIEVE_ERROR
+    mock_logger.reset_mock()
+    args_ids_err = args_factory(ids="1,2")
+    with patch('qdrant_manager.commands.get.json.dump'):
+        get_points(mock_client, "test-collection", args_ids_err)
+        # Check that error was logged
+        mock_logger.error.assert_called_with("Failed to retrieve points: Retrieval failed")
 
 
-def test_get_points_by_filter():
+def test_get_points_by_filter(mock_client, args_factory, make_points, patch_get):
     """Test retrieving points by filter."""
-    # Mock the Qdrant client
-    mock_client = MagicMock()
+    mock_logger = patch_get.logger
 
     # Set up mock points
-    mock_point1 = MagicMock()
-    mock_point1.id = 1
-    mock_point1.payload = {"field1": "value1"}
-    mock_point1.vector = [0.1, 0.2, 0.3]
-
-    mock_point2 = MagicMock()
-    mock_point2.id = 2
-    mock_point2.payload = {"field1": "value2"}
-    mock_point2.vector = [0.4, 0.5, 0.6]
+    mock_point1, mock_point2 = make_points({"field1": "value1"}, {"field1": "value2"})
 
     # Configure scroll to return mock points
     mock_client.scroll.side_effect = [
@@ -94,68 +111,55 @@ def test_get_points_by_filter():
     ]
 
     # Test retrieving points with filter
-    with patch('qdrant_manager.commands.get.logger') as mock_logger:
-        mock_args_filter = MagicMock()
-        mock_args_filter.id_file = None
-        mock_args_filter.ids = None
-        mock_args_filter.filter = '{"key":"field1", "match":{"value":"value1"}}'
-        mock_args_filter.with_vectors = False
-        mock_args_filter.format = "json"
-        mock_args_filter.output = None
-        mock_args_filter.limit = 10 # Default for get
-
-        with patch('builtins.print') as mock_print, patch('qdrant_manager.commands.get.json.dump') as mock_json_dump:
-            get_points(mock_client, "test-collection", mock_args_filter)
-
-            # Check that points were retrieved using scroll
-            mock_client.scroll.assert_called_once()
-            mock_client.retrieve.assert_not_called()
-            # Check output
-            mock_json_dump.assert_called_once()
+    args_filter = args_factory(filter=FIELD1_FILTER)
+
+    with patch('qdrant_manager.commands.get.json.dump') as mock_json_dump:
+        get_points(mock_client, "test-collection", args_filter)
+
+        # Check that points were retrieved using scroll
+        mock_client.scroll.assert_called_once()
+        mock_client.retrieve.assert_not_called()
+        # Check output
+        mock_json_dump.assert_called_once()
 
     # Test with no points found
     mock_client.reset_mock()
     mock_client.scroll.side_effect = [([], None)]
-    with patch('qdrant_manager.commands.get.logger') as mock_logger:
-        mock_args_filter_none = MagicMock(ids=None, id_file=None, filter='{"key":"field1", "match":{"value":"nonexistent"}}', 
-                                          with_vectors=False, format="json", output=None, limit=10)
-        with patch('builtins.print'), patch('qdrant_manager.commands.get.json.dump') as mock_json_dump:
-            get_points(mock_client, "test-collection", mock_args_filter_none)
-            mock_client.scroll.assert_called_once()
-            # Check logger info message
-            mock_logger.info.assert_called_with("No points found matching the criteria.")
-            mock_json_dump.assert_not_called()
+    mock_logger.reset_mock()
+    args_filter_none = args_factory(filter='{"key":"field1", "match":{"value":"nonexistent"}}')
+    with patch('qdrant_manager.commands.get.json.dump') as mock_json_dump:
+        get_points(mock_client, "test-collection", args_filter_none)
+        mock_client.scroll.assert_called_once()
+        # Check logger info message
+        mock_logger.info.assert_called_with("No points found matching the criteria.")
+        mock_json_dump.assert_not_called()
 
     # Test with exception
     mock_client.reset_mock()
-    mock_client.scroll.side_effect = Exception("Scroll failed")
-    with patch('qdrant_manager.commands.get.logger') as mock_logger:
-        mock_args_filter_err = MagicMock(ids=None, id_file=None, filter='{"key":"f", "match":{"value":"v"}}', 
-                                         with_vectors=False, format="json", output=None, limit=10)
-        with patch('builtins.print'), patch('qdrant_manager.commands.get.json.dump'):
-            get_points(mock_client, "test-collection", mock_args_filter_err)
-            # Check that error was logged
-            mock_logger.error.assert_called_with("Failed to retrieve points: Scroll failed") 
+    mock_client.scroll.side_effect = SCROLL_ERROR
+    mock_logger.reset_mock()
+    args_filter_err = args_factory(filter='{"key":"f", "match":{"value":"v"}}')
+    with patch('qdrant_manager.commands.get.json.dump'):
+        get_points(mock_client, "test-collection", args_filter_err)
+        # Check that the scroll was retried without real waits before the error was logged
+        assert mock_client.scroll.call_count == 3
+        assert patch_get.sleep.call_count == 2
+        mock_logger.error.assert_called_with("Failed to retrieve points: Scroll failed") 
 
 
-def test_parse_ids_for_get():
+def test_parse_ids_for_get(args_factory, patch_get):
     """Test parsing document IDs for get operation."""
-    import tempfile
-
+    mock_logger = patch_get.logger
     # Test parsing from args.ids string
-    mock_args_ids = MagicMock()
-    mock_args_ids.ids = "1,2,3" 
-    mock_args_ids.id_file = None
+    args_ids = args_factory(ids="1,2,3")
     
-    ids = _parse_ids_for_get(mock_args_ids)
+    ids = _parse_ids_for_get(args_ids)
     assert ids == ["1", "2", "3"]
     
     # Test parsing with whitespace and empty elements
-    mock_args_whitespace = MagicMock()
-    mock_args_whitespace.ids = "1, 2, , 3  "
-    mock_args_whitespace.id_file = None
+    args_whitespace = args_factory(ids="1, 2, , 3  ")
     
-    ids = _parse_ids_for_get(mock_args_whitespace)
+    ids = _parse_ids_for_get(args_whitespace)
     assert ids == ["1", "2", "3"]  # Empty elements should be filtered out
     
     # Test parsing from ID file
@@ -164,87 +168,69 @@ def test_parse_ids_for_get():
         temp_file_path = temp_file.name
     
     try:
-        mock_args_file = MagicMock()
-        mock_args_file.ids = None
-        mock_args_file.id_file = temp_file_path
+        args_file = args_factory(id_file=temp_file_path)
         
-        ids = _parse_ids_for_get(mock_args_file)
+        ids = _parse_ids_for_get(args_file)
         assert ids == ["10", "20", "30"]
         
         # Test with file not found
-        mock_args_missing_file = MagicMock()
-        mock_args_missing_file.ids = None
-        mock_args_missing_file.id_file = "nonexistent_file.txt"
-        
-        with patch('qdrant_manager.commands.get.logger') as mock_logger:
-            ids = _parse_ids_for_get(mock_args_missing_file)
-            assert ids is None
-            mock_logger.error.assert_called_once()
+        args_missing_file = args_factory(id_file="nonexistent_file.txt")
         
+        ids = _parse_ids_for_get(args_missing_file)
+        assert ids is None
+        mock_logger.error.assert_called_once()
+
         # Test with neither ids nor id_file
-        mock_args_none = MagicMock()
-        mock_args_none.ids = None
-        mock_args_none.id_file = None
+        args_none = args_factory()
         
-        ids = _parse_ids_for_get(mock_args_none)
+        ids = _parse_ids_for_get(args_none)
         assert ids is None
         
     finally:
-        import os
         os.unlink(temp_file_path)  # Clean up
 
 
-def test_parse_filter_for_get():
+def test_parse_filter_for_get(args_factory):
     """Test parsing filter for get operation."""
     # Test valid filter
-    mock_args_valid = MagicMock()
-    mock_args_valid.filter = '{"key":"field1", "match":{"value":"value1"}}'
+    args_valid = args_factory(filter=FIELD1_FILTER)
     
-    filter_obj = _parse_filter_for_get(mock_args_valid)
+    filter_obj = _parse_filter_for_get(args_valid)
     assert isinstance(filter_obj, Filter)
     assert len(filter_obj.must) == 1
     assert filter_obj.must[0].key == "field1"
     assert filter_obj.must[0].match.value == "value1"
     
-    # Test missing match.value
-    mock_args_no_value = MagicMock()
-    mock_args_no_value.filter = '{"key":"field1", "match":{}}'
-    
-    with patch('qdrant_manager.commands.get.logger') as mock_logger:
-        filter_obj = _parse_filter_for_get(mock_args_no_value)
-        assert filter_obj is None
-        mock_logger.error.assert_called()
-    
-    # Test invalid structure
-    mock_args_invalid = MagicMock()
-    mock_args_invalid.filter = '{"invalid_key":"value"}'
-    
-    with patch('qdrant_manager.commands.get.logger') as mock_logger:
-        filter_obj = _parse_filter_for_get(mock_args_invalid)
-        assert filter_obj is None
-        mock_logger.warning.assert_called_with("Invalid filter structure. Must contain 'key' and 'match'. Proceeding without filter.")
-    
-    # Test invalid JSON
-    mock_args_bad_json = MagicMock()
-    mock_args_bad_json.filter = '{"key":"value", invalid json'
-    
-    with patch('qdrant_manager.commands.get.logger') as mock_logger:
-        filter_obj = _parse_filter_for_get(mock_args_bad_json)
-        assert filter_obj is None
-        mock_logger.error.assert_called_with(f"Invalid JSON in filter: {mock_args_bad_json.filter}")
-    
     # Test None filter
-    mock_args_none = MagicMock()
-    mock_args_none.filter = None
+    args_none = args_factory()
     
-    filter_obj = _parse_filter_for_get(mock_args_none)
+    filter_obj = _parse_filter_for_get(args_none)
+    assert filter_obj is None
+
+
+# (filter argument, logger method, expected message)
+INVALID_FILTER_CASES = [
+    pytest.param('{"key":"field1", "match":{}}', "error",
+                 "Could not parse filter structure.", id="missing-match-value"),
+    pytest.param('{"invalid_key":"value"}', "warning",
+                 "Invalid filter structure. Must contain 'key' and 'match'. Proceeding without filter.",
+                 id="invalid-structure"),
+    pytest.param('{"key":"value", invalid json', "error",
+                 """Invalid JSON in filter: {"key":"value", invalid json""", id="invalid-json"),
+]
+
+@pytest.mark.parametrize("filter_arg,log_method,expected_message", INVALID_FILTER_CASES)
+def test_parse_filter_for_get_invalid(args_factory, patch_get, filter_arg, log_method, expected_message):
+    """Test that unusable filters are logged and ignored."""
+    filter_obj = _parse_filter_for_get(args_factory(filter=filter_arg))
+
     assert filter_obj is None
+    getattr(patch_get.logger, log_method).assert_called_once_with(expected_message)
 
 
-def test_get_points_csv_output():
+def test_get_points_csv_output(mock_client, args_factory, patch_get):
     """Test retrieving points with CSV output."""
-    # Mock the Qdrant client
-    mock_client = MagicMock()
+    mock_logger = patch_get.logger
     
     # Create a PointStruct for more realistic testing
     point1 = PointStruct(
@@ -262,53 +248,36 @@ def test_get_points_csv_output():
     # Test CSV output to stdout
     mock_client.retrieve.return_value = [point1, point2]
     
-    with patch('qdrant_manager.commands.get.logger'), \
-         patch('sys.stdout', new_callable=StringIO) as mock_stdout, \
-         patch('qdrant_manager.commands.get.csv.DictWriter.writerow') as mock_writerow, \
+    with patch('qdrant_manager.commands.get.csv.DictWriter.writerow') as mock_writerow, \
          patch('qdrant_manager.commands.get.csv.DictWriter.writeheader') as mock_writeheader:
         
-        mock_args_csv = MagicMock()
-        mock_args_csv.ids = "1,2"
-        mock_args_csv.id_file = None
-        mock_args_csv.filter = None
-        mock_args_csv.with_vectors = True
-        mock_args_csv.format = "csv"
-        mock_args_csv.output = None
-        mock_args_csv.limit = 10
+        args_csv = args_factory(ids="1,2", with_vectors=True, format="csv")
         
-        get_points(mock_client, "test-collection", mock_args_csv)
+        get_points(mock_client, "test-collection", args_csv)
         
         # Check that CSV format was used
         mock_writeheader.assert_called_once()
         assert mock_writerow.call_count == 2
     
     # Test CSV output to file
-    with patch('qdrant_manager.commands.get.logger') as mock_logger, \
-         patch('builtins.open', new_callable=MagicMock) as mock_open, \
+    mock_logger.reset_mock()
+    with patch('builtins.open', new_callable=MagicMock) as mock_open, \
          patch('qdrant_manager.commands.get.csv.DictWriter') as mock_dictwriter:
         
-        mock_args_csv_file = MagicMock()
-        mock_args_csv_file.ids = "1,2"
-        mock_args_csv_file.id_file = None
-        mock_args_csv_file.filter = None
-        mock_args_csv_file.with_vectors = False
-        mock_args_csv_file.format = "csv"
-        mock_args_csv_file.output = "output.csv"
-        mock_args_csv_file.limit = 10
+        args_csv_file = args_factory(ids="1,2", format="csv", output="output.csv")
         
         mock_client.retrieve.return_value = [point1, point2]
         
-        get_points(mock_client, "test-collection", mock_args_csv_file)
+        get_points(mock_client, "test-collection", args_csv_file)
         
         # Check that file was opened for writing
-        mock_open.assert_called_once_with("output.csv", 'w', newline='')
+        mock_open.assert_called_once_with("output.csv", 'w', newline='', buffering=OUTPUT_BUFFER_SIZE)
         # Check logger message for file output
         mock_logger.info.assert_called_with("Output written to output.csv")
 
-def test_get_points_with_named_vectors():
+def test_get_points_with_named_vectors(mock_client, args_factory, patch_get):
     """Test retrieving points with named vectors."""
-    # Mock the Qdrant client
-    mock_client = MagicMock()
+    mock_logger = patch_get.logger
     
     # Create points with named vectors
     point_with_named_vectors = PointStruct(
@@ -320,20 +289,11 @@ def test_get_points_with_named_vectors():
     mock_client.retrieve.return_value = [point_with_named_vectors]
     
     # Test JSON output with named vectors
-    with patch('qdrant_manager.commands.get.logger'), \
-         patch('builtins.print'), \
-         patch('qdrant_manager.commands.get.json.dump') as mock_json_dump:
+    with patch('qdrant_manager.commands.get.json.dump') as mock_json_dump:
         
-        mock_args = MagicMock()
-        mock_args.ids = "1"
-        mock_args.id_file = None
-        mock_args.filter = None
-        mock_args.with_vectors = True
-        mock_args.format = "json"
-        mock_args.output = None
-        mock_args.limit = 10
+        get_args = args_factory(ids="1", with_vectors=True)
         
-        get_points(mock_client, "test-collection", mock_args)
+        get_points(mock_client, "test-collection", get_args)
         
         # Check that json.dump was called with the right data
         args, _ = mock_json_dump.call_args
@@ -344,37 +304,28 @@ def test_get_points_with_named_vectors():
         assert "image" in points_list[0]["vector"]
     
     # Test CSV output with named vectors
-    with patch('qdrant_manager.commands.get.logger'), \
-         patch('sys.stdout', new_callable=StringIO) as mock_stdout, \
-         patch('qdrant_manager.commands.get.csv.DictWriter.writerow') as mock_writerow, \
+    mock_logger.reset_mock()
+    with patch('qdrant_manager.commands.get.csv.DictWriter.writerow') as mock_writerow, \
          patch('qdrant_manager.commands.get.csv.DictWriter.writeheader') as mock_writeheader:
         
-        mock_args_csv = MagicMock()
-        mock_args_csv.ids = "1"
-        mock_args_csv.id_file = None
-        mock_args_csv.filter = None
-        mock_args_csv.with_vectors = True
-        mock_args_csv.format = "csv"
-        mock_args_csv.output = None
-        mock_args_csv.limit = 10
+        args_csv = args_factory(ids="1", with_vectors=True, format="csv")
         
-        get_points(mock_client, "test-collection", mock_args_csv)
+        get_points(mock_client, "test-collection", args_csv)
         
         # Check that CSV headers include vector names
         mock_writeheader.assert_called_once()
         mock_writerow.assert_called_once()
 
-def test_get_points_empty_collection_name():
+def test_get_points_empty_collection_name(mock_client, args_factory, patch_get):
     """Test handling of empty collection name."""
-    mock_client = MagicMock()
+    mock_logger = patch_get.logger
     
-    with patch('qdrant_manager.commands.get.logger') as mock_logger:
-        mock_args = MagicMock()
-        
-        # Call with empty collection name
-        get_points(mock_client, "", mock_args)
-        
-        # Check that error was logged and no further calls were made
-        mock_logger.error.assert_called_once_with("Collection name is required for 'get' command.")
-        mock_client.retrieve.assert_not_called()
-        mock_client.scroll.assert_not_called() 
\ No newline at end of file
+    get_args = args_factory()
+
+    # Call with empty collection name
+    get_points(mock_client, "", get_args)
+
+    # Check that error was logged and no further calls were made
+    mock_logger.error.assert_called_once_with("Collection name is required for 'get' command.")
+    mock_client.retrieve.assert_not_called()
+    mock_client.scroll.assert_not_called() 
\ No newline at end of file
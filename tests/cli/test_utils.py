@@ -1,9 +1,8 @@
 """Tests for utility functions."""
-import json
+import logging
 import pytest
-from unittest.mock import patch, MagicMock, mock_open
-import os
-import yaml
+from types import SimpleNamespace
+from unittest.mock import MagicMock
 
 from qdrant_manager.utils import load_configuration, initialize_qdrant_client
 from qdrant_manager.config import create_default_config, get_config_dir, get_profiles, update_config
@@ -12,13 +11,14 @@ from qdrant_manager.config import create_default_config, get_config_dir, get_pro
 @pytest.fixture
 def mock_args():
     """Fixture for mock arguments."""
-    args = MagicMock()
-    args.profile = None
-    args.url = None
-    args.port = None
-    args.api_key = None
-    args.collection = None
-    return args
+    return SimpleNamespace(profile=None, url=None, port=None, api_key=None, collection=None)
+
+@pytest.fixture
+def mock_load_config_call(monkeypatch, utils_mod):
+    """Replace load_config where utils calls it."""
+    mock = MagicMock()
+    monkeypatch.setattr(utils_mod, 'load_config', mock)
+    return mock
 
 # Define standard mock config data for tests
 MOCK_DEFAULT_CONFIG = {
@@ -34,30 +34,22 @@ MOCK_PROFILE_CONFIG = {
     "collection": "profile_collection"
 }
 
-@patch('qdrant_manager.utils.load_config') # Patch load_config where it's called
-def test_load_configuration_default(mock_load_config_call, mock_args):
-    """Test loading default configuration."""
-    mock_load_config_call.return_value = MOCK_DEFAULT_CONFIG.copy()
-    config = load_configuration(mock_args)
-    assert config["url"] == "http://localhost_default"
-    assert config["port"] == 6333
-    assert config["api_key"] == "default_key"
-    assert config["collection"] == "default_collection"
-    mock_load_config_call.assert_called_once_with() # Called with no args for default
+# Follow-up error logged after any missing required configuration key
+MISSING_CONFIG_HINT = "Please update your configuration or provide command-line arguments."
 
-@patch('qdrant_manager.utils.load_config')
-def test_load_configuration_profile(mock_load_config_call, mock_args):
-    """Test loading configuration from a profile."""
-    mock_args.profile = "myprofile"
-    mock_load_config_call.return_value = MOCK_PROFILE_CONFIG.copy()
+@pytest.mark.parametrize("profile,loaded,load_args", [
+    pytest.param(None, MOCK_DEFAULT_CONFIG, (), id="default"),
+    pytest.param("myprofile", MOCK_PROFILE_CONFIG, ("myprofile",), id="profile"),
+])
+def test_load_configuration(mock_load_config_call, mock_args, profile, loaded, load_args):
+    """Test loading the default or a named profile's configuration unchanged."""
+    mock_args.profile = profile
+    mock_load_config_call.return_value = loaded.copy()
     config = load_configuration(mock_args)
-    assert config["url"] == "http://profile.host"
-    assert config["port"] == 1234
-    assert config["api_key"] == "profile_key"
-    assert config["collection"] == "profile_collection"
-    mock_load_config_call.assert_called_once_with("myprofile")
+    assert config == loaded
+    # Called with no args for default, with the profile name otherwise
+    mock_load_config_call.assert_called_once_with(*load_args)
 
-@patch('qdrant_manager.utils.load_config')
 def test_load_configuration_override_args(mock_load_config_call, mock_args):
     """Test overriding config with command-line arguments."""
     mock_load_config_call.return_value = MOCK_DEFAULT_CONFIG.copy()
@@ -72,7 +64,6 @@ def test_load_configuration_override_args(mock_load_config_call, mock_args):
     assert config["collection"] == "cmd_collection"
     mock_load_config_call.assert_called_once_with() # Called default config
 
-@patch('qdrant_manager.utils.load_config')
 def test_load_configuration_profile_override_args(mock_load_config_call, mock_args):
     """Test overriding profile config with command-line arguments."""
     mock_args.profile = "myprofile"
@@ -89,29 +80,21 @@ def test_load_configuration_profile_override_args(mock_load_config_call, mock_ar
     mock_load_config_call.assert_called_once_with("myprofile")
 
 # Keep the test for missing required, it should still work with mocked load_config
-@patch('qdrant_manager.utils.load_config')
-@patch('qdrant_manager.utils.logger')
-@patch('sys.exit')
-def test_load_configuration_missing_required(mock_exit, mock_logger, mock_load_config_call, mock_args):
-    """Test load_configuration exits if required fields are missing."""
-    # Simulate load_config returning a config missing 'url'
-    mock_load_config_call.return_value = {"port": 1234} 
-    load_configuration(mock_args)
-    # Check for the specific error about url being missing
-    mock_logger.error.assert_any_call("Missing required configuration: url")
-    mock_logger.error.assert_any_call("Please update your configuration or provide command-line arguments.")
-    mock_exit.assert_called_once_with(1)
-
-@patch('qdrant_manager.utils.load_config')
-@patch('qdrant_manager.utils.logger')
-@patch('sys.exit')
-def test_load_configuration_missing_required_port(mock_exit, mock_logger, mock_load_config_call, mock_args):
-    """Test load_configuration exits if required port is missing."""
-    # Simulate load_config returning a config missing 'port'
-    mock_load_config_call.return_value = {"url": "http://test.com"} 
-    load_configuration(mock_args)
-    mock_logger.error.assert_any_call("Missing required configuration: port")
-    mock_logger.error.assert_any_call("Please update your configuration or provide command-line arguments.")
+@pytest.mark.parametrize("loaded,missing", [
+    pytest.param({"port": 1234}, "url", id="missing-url"),
+    pytest.param({"url": "http://test.com"}, "port", id="missing-port"),
+])
+def test_load_configuration_missing_required(mock_load_config_call, mock_args, monkeypatch, utils_mod, caplog, loaded, missing):
+    """Test load_configuration exits if a required field is missing."""
+    mock_exit = MagicMock()
+    monkeypatch.setattr(utils_mod.sys, 'exit', mock_exit)
+    # Simulate load_config returning a config missing one required key
+    mock_load_config_call.return_value = loaded
+    with caplog.at_level(logging.ERROR, logger='qdrant_manager.utils'):
+        load_configuration(mock_args)
+    # Check for the specific error about the missing key
+    assert f"Missing required configuration: {missing}" in caplog.messages
+    assert MISSING_CONFIG_HINT in caplog.messages
     mock_exit.assert_called_once_with(1)
 
 # You might want to add tests for initialize_qdrant_client here as well,
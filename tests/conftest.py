@@ -1,15 +1,112 @@
 """Shared fixtures for qdrant-manager tests."""
+import socket
 import pytest
+from types import SimpleNamespace
 from unittest.mock import MagicMock, patch
 
+from qdrant_client import QdrantClient
+
+from qdrant_manager import config, utils
+
+
+# The memoized config helpers, captured before any test can monkeypatch them
+_CONFIG_CACHES = (config.get_config_dir, config.get_config_file, config._load_config_file)
+
+
+@pytest.fixture(autouse=True)
+def clear_config_caches():
+    """Clear memoized config paths and files so per-test patches take effect."""
+    for cached in _CONFIG_CACHES:
+        cached.cache_clear()
+    yield
+    for cached in _CONFIG_CACHES:
+        cached.cache_clear()
+
+
+@pytest.fixture(autouse=True)
+def silence_tracebacks(monkeypatch):
+    """No-op traceback.print_exc so the batch/get error paths skip formatting stack traces."""
+    monkeypatch.setattr('traceback.print_exc', lambda *args, **kwargs: None)
+
+
+@pytest.fixture(autouse=True)
+def _no_network(request, monkeypatch):
+    """Fail fast on socket connects, e.g. from a missed QdrantClient patch; opt out with allow_network."""
+    if request.node.get_closest_marker("allow_network"):
+        return
+
+    def guard(self, address):
+        raise RuntimeError(f"Network blocked in tests: {address}")
+
+    monkeypatch.setattr(socket.socket, 'connect', guard)
+
+
+@pytest.fixture(scope="module")
+def utils_mod():
+    """The qdrant_manager.utils module, for object-form monkeypatch.setattr."""
+    return utils
+
+
+def _patch_logger(monkeypatch, command, **extra):
+    """Replace qdrant_manager.commands.<command>.logger (plus any extra mocks) for one test."""
+    mocks = SimpleNamespace(logger=MagicMock(), **extra)
+    monkeypatch.setattr(f'qdrant_manager.commands.{command}.logger', mocks.logger)
+    return mocks
+
+
+@pytest.fixture
+def patch_delete(monkeypatch):
+    """Replace the delete command's logger for one test."""
+    return _patch_logger(monkeypatch, 'delete')
+
+
+@pytest.fixture
+def patch_get(monkeypatch):
+    """Replace the get command's logger and scroll-retry sleep for one test."""
+    mocks = _patch_logger(monkeypatch, 'get', sleep=MagicMock())
+    monkeypatch.setattr('qdrant_manager.commands.get.time.sleep', mocks.sleep)
+    return mocks
+
+
+@pytest.fixture
+def patch_batch(monkeypatch):
+    """Replace the batch command's logger for one test."""
+    return _patch_logger(monkeypatch, 'batch')
+
+
+@pytest.fixture
+def patch_list(monkeypatch):
+    """Replace the list command's logger for one test."""
+    return _patch_logger(monkeypatch, 'list_cmd')
+
 
 @pytest.fixture
-def mock_client():
-    """Create a mock Qdrant client."""
-    client = MagicMock()
+def patch_info(monkeypatch):
+    """Replace the info command's logger for one test."""
+    return _patch_logger(monkeypatch, 'info')
+
+
+@pytest.fixture(scope="session")
+def _qdrant_client_api():
+    """Attribute names of QdrantClient, introspected once per session."""
+    return tuple(dir(QdrantClient))
+
+
+@pytest.fixture
+def mock_client(_qdrant_client_api):
+    """Create a mock Qdrant client restricted to the real client's API."""
+    client = MagicMock(spec=_qdrant_client_api)
     return client
 
 
+@pytest.fixture
+def memory_client():
+    """Create a real Qdrant client backed by qdrant-client's in-process local mode."""
+    client = QdrantClient(location=":memory:")
+    yield client
+    client.close()
+
+
 @pytest.fixture
 def mock_models():
     """Create a mock for the models module."""